@@ -2,19 +2,34 @@
 Core game logic for Connect Four (7x6) used by both the Jupyter notebook
 and the Streamlit web demo. Centralising these utilities keeps behaviour
 identical across interfaces and avoids code duplication.
+
+Two board representations are used:
+
+- The public helpers work on a list of 6 rows x 7 columns (`board[row][col]`,
+  row 0 at the top), which the interfaces read and render directly.
+- The AI search converts that board once per call into two bitboard ints
+  (see "Bitboard encoding"), so nothing on the hot path touches the lists.
 """
 
 from __future__ import annotations
 
 import math
-import random
-from typing import List, Optional, Sequence, Tuple
+import time
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
 # Board configuration
 ROWS: int = 6
 COLS: int = 7
 CONNECT: int = 4
 
+# Search order: centre column first, then alternating outwards. Central
+# columns take part in the most windows, so trying them first lets alpha-beta
+# find strong moves early and prune their weaker siblings.
+COLUMN_ORDER: Tuple[int, ...] = tuple(
+    sorted(range(COLS), key=lambda col: abs(col - COLS // 2))
+)
+
 # Players
 EMPTY: int = 0
 HUMAN: int = 1
@@ -27,6 +42,35 @@ TOKEN_MAP = {
     AI: "🟡",  # Computer (yellow)
 }
 
+# Every four-cell window on the board as (row, col) pairs, computed once at
+# import. Row 0 is the top row; "positive" diagonals run down-right.
+Cell = Tuple[int, int]
+Window = Tuple[Cell, ...]
+
+HORIZONTAL_WINDOWS: Tuple[Window, ...] = tuple(
+    tuple((row, col + offset) for offset in range(CONNECT))
+    for row in range(ROWS)
+    for col in range(COLS - 3)
+)
+VERTICAL_WINDOWS: Tuple[Window, ...] = tuple(
+    tuple((row + offset, col) for offset in range(CONNECT))
+    for col in range(COLS)
+    for row in range(ROWS - 3)
+)
+DIAG_POS_WINDOWS: Tuple[Window, ...] = tuple(
+    tuple((row + offset, col + offset) for offset in range(CONNECT))
+    for row in range(ROWS - 3)
+    for col in range(COLS - 3)
+)
+DIAG_NEG_WINDOWS: Tuple[Window, ...] = tuple(
+    tuple((row - offset, col + offset) for offset in range(CONNECT))
+    for row in range(3, ROWS)
+    for col in range(COLS - 3)
+)
+ALL_WINDOWS: Tuple[Window, ...] = (
+    HORIZONTAL_WINDOWS + VERTICAL_WINDOWS + DIAG_POS_WINDOWS + DIAG_NEG_WINDOWS
+)
+
 
 # --------------------------------------------------------------------------- #
 # Board helpers
@@ -37,7 +81,12 @@ def create_board() -> List[List[int]]:
 
 
 def copy_board(board: Sequence[Sequence[int]]) -> List[List[int]]:
-    """Deep copy a board (list-of-lists)."""
+    """
+    Deep copy a board (list-of-lists).
+
+    For interface code that needs a snapshot; the AI search never copies
+    boards, since each node is just a `(position, mask)` pair of ints.
+    """
     return [list(row) for row in board]
 
 
@@ -63,44 +112,53 @@ def drop_piece(board: List[List[int]], row: int, col: int, piece: int) -> None:
 
 def board_full(board: Sequence[Sequence[int]]) -> bool:
     """True when every column is filled to the top."""
-    return all(board[0][col] != EMPTY for col in range(COLS))
+    # Pieces stack from the bottom, so the top row alone decides it
+    return EMPTY not in board[0]
 
 
 def get_valid_locations(board: Sequence[Sequence[int]]) -> List[int]:
-    """Return all columns that can accept a move."""
-    return [col for col in range(COLS) if is_valid_location(board, col)]
+    """Return all columns that can accept a move, centre-first (see COLUMN_ORDER)."""
+    top_row = board[0]
+    return [col for col in COLUMN_ORDER if top_row[col] == EMPTY]
 
 
 # --------------------------------------------------------------------------- #
 # Win detection
 # --------------------------------------------------------------------------- #
-def winning_move(board: Sequence[Sequence[int]], piece: int) -> bool:
-    """Check horizontal, vertical, and diagonal connect-four conditions."""
-    # Horizontal
-    for row in range(ROWS):
-        for col in range(COLS - 3):
-            if all(board[row][col + offset] == piece for offset in range(CONNECT)):
-                return True
-
-    # Vertical
-    for col in range(COLS):
-        for row in range(ROWS - 3):
-            if all(board[row + offset][col] == piece for offset in range(CONNECT)):
-                return True
-
-    # Positive diagonal
-    for row in range(ROWS - 3):
-        for col in range(COLS - 3):
-            if all(board[row + offset][col + offset] == piece for offset in range(CONNECT)):
-                return True
-
-    # Negative diagonal
-    for row in range(3, ROWS):
-        for col in range(COLS - 3):
-            if all(board[row - offset][col + offset] == piece for offset in range(CONNECT)):
-                return True
-
-    return False
+def _compile_winning_move():
+    """
+    Generate `winning_move` as straight-line code for the fixed board size.
+
+    The 69 windows are known at import, so rather than looping over them at
+    runtime each one becomes an inlined `if ... and ...: return True` test.
+    The rows are unpacked into locals once so every cell access is a single
+    subscript, and `and` short-circuits on the first mismatching cell.
+    """
+    rows = ", ".join(f"r{row}" for row in range(ROWS))
+    lines = [
+        "def winning_move(board, piece):",
+        '    """Check horizontal, vertical, and diagonal connect-four conditions."""',
+        f"    {rows}, = board",
+    ]
+    for window in ALL_WINDOWS:
+        cells = " and ".join(f"r{row}[{col}] == piece" for row, col in window)
+        lines.append(f"    if {cells}:")
+        lines.append("        return True")
+    lines.append("    return False")
+
+    namespace: Dict[str, object] = {}
+    exec(compile("\n".join(lines), "<winning_move>", "exec"), namespace)
+    function = namespace["winning_move"]
+    function.__module__ = __name__
+    function.__annotations__ = {
+        "board": "Sequence[Sequence[int]]",
+        "piece": "int",
+        "return": "bool",
+    }
+    return function
+
+
+winning_move = _compile_winning_move()
 
 
 # --------------------------------------------------------------------------- #
@@ -109,10 +167,13 @@ def winning_move(board: Sequence[Sequence[int]], piece: int) -> bool:
 def evaluate_window(window: Sequence[int], piece: int) -> int:
     """Assign a score to a window of four cells."""
     opp_piece = HUMAN if piece == AI else AI
-    count_self = window.count(piece)
-    count_opp = window.count(opp_piece)
-    count_empty = window.count(EMPTY)
+    return _window_score(
+        window.count(piece), window.count(opp_piece), window.count(EMPTY)
+    )
+
 
+def _window_score(count_self: int, count_opp: int, count_empty: int) -> int:
+    """Score a window from its piece counts (shared by list and bitboard paths)."""
     score = 0
     if count_self == 4:
         score += 100_000
@@ -131,6 +192,42 @@ def evaluate_window(window: Sequence[int], piece: int) -> int:
     return score
 
 
+# Window scores precomputed for every possible window content. A window's four
+# cells are packed two bits each, (c0 << 6) | (c1 << 4) | (c2 << 2) | c3, and
+# used as an index into a 256-entry table per player.
+_PACKED_WINDOW_SCORES: Dict[int, Tuple[int, ...]] = {
+    piece: tuple(
+        evaluate_window([(code >> shift) & 3 for shift in (6, 4, 2, 0)], piece)
+        for code in range(4 ** CONNECT)
+    )
+    for piece in (HUMAN, AI)
+}
+
+# The same rules indexed by piece counts, for the bitboard search:
+# _COUNT_SCORES[count_ai * 5 + count_human] is the AI's score for a window,
+# and the *_DROP_DELTAS tables give the change when the AI or the human adds
+# one stone to that window.
+_COUNT_SCORES: Tuple[int, ...] = tuple(
+    _window_score(count_ai, count_human, CONNECT - count_ai - count_human)
+    for count_ai in range(CONNECT + 1)
+    for count_human in range(CONNECT + 1)
+)
+_AI_DROP_DELTAS: Tuple[int, ...] = tuple(
+    _COUNT_SCORES[(count_ai + 1) * 5 + count_human] - _COUNT_SCORES[count_ai * 5 + count_human]
+    if count_ai + count_human < CONNECT
+    else 0
+    for count_ai in range(CONNECT + 1)
+    for count_human in range(CONNECT + 1)
+)
+_HUMAN_DROP_DELTAS: Tuple[int, ...] = tuple(
+    _COUNT_SCORES[count_ai * 5 + count_human + 1] - _COUNT_SCORES[count_ai * 5 + count_human]
+    if count_ai + count_human < CONNECT
+    else 0
+    for count_ai in range(CONNECT + 1)
+    for count_human in range(CONNECT + 1)
+)
+
+
 def score_position(board: Sequence[Sequence[int]], piece: int = AI) -> int:
     """Evaluate the board from the perspective of `piece`."""
     score = 0
@@ -138,139 +235,587 @@ def score_position(board: Sequence[Sequence[int]], piece: int = AI) -> int:
     center_column = COLS // 2
     score += sum(1 for row in range(ROWS) if board[row][center_column] == piece) * 6
 
-    # Horizontal
-    for row in range(ROWS):
-        for col in range(COLS - 3):
-            window = [board[row][col + offset] for offset in range(CONNECT)]
-            score += evaluate_window(window, piece)
-
-    # Vertical
-    for col in range(COLS):
-        for row in range(ROWS - 3):
-            window = [board[row + offset][col] for offset in range(CONNECT)]
-            score += evaluate_window(window, piece)
-
-    # Positive diagonal
-    for row in range(ROWS - 3):
-        for col in range(COLS - 3):
-            window = [board[row + offset][col + offset] for offset in range(CONNECT)]
-            score += evaluate_window(window, piece)
-
-    # Negative diagonal
-    for row in range(3, ROWS):
-        for col in range(COLS - 3):
-            window = [board[row - offset][col + offset] for offset in range(CONNECT)]
-            score += evaluate_window(window, piece)
+    window_scores = _PACKED_WINDOW_SCORES[piece]
+    for (r0, c0), (r1, c1), (r2, c2), (r3, c3) in ALL_WINDOWS:
+        code = board[r0][c0] << 6 | board[r1][c1] << 4 | board[r2][c2] << 2 | board[r3][c3]
+        score += window_scores[code]
 
     return score
 
 
+def terminal_value(board: Sequence[Sequence[int]]) -> Optional[float]:
+    """
+    Game-over score from the AI's point of view, or None if play continues.
+
+    Returns +inf when the AI has four in a row, -inf when the human has, and
+    0 for a full board. The board is encoded once, so callers that need both
+    "is it over?" and "who won?" pay for a single pass.
+    """
+    ai_stones, mask = board_to_bitboards(board, AI)
+    if _bitboard_wins(ai_stones):
+        return math.inf
+    if _bitboard_wins(ai_stones ^ mask):
+        return -math.inf
+    if mask == _BOARD_MASK:
+        return 0
+    return None
+
+
 def is_terminal_node(board: Sequence[Sequence[int]]) -> bool:
     """Terminal when someone wins or the board fills up."""
-    return winning_move(board, HUMAN) or winning_move(board, AI) or board_full(board)
+    return terminal_value(board) is not None
+
+
+# --------------------------------------------------------------------------- #
+# Bitboard encoding (search internals)
+# --------------------------------------------------------------------------- #
+# The search runs on a pair of Python ints instead of the list-of-lists board.
+# Each column owns ROWS + 1 consecutive bits, bottom cell first, with one spare
+# sentinel bit on top so that shifting a line never wraps into the next column:
+#
+#     col:  0  1  2  3  4  5  6
+#           6 13 20 27 34 41 48   <- sentinel
+#           5 12 19 26 33 40 47   <- row 0 (top)
+#           ...
+#           0  7 14 21 28 35 42   <- row 5 (bottom)
+#
+# A position is described by `position` (stones of the side to move) and
+# `mask` (every occupied cell).  This is the layout used by the Fhourstones
+# benchmark and Pascal Pons' solver, which keeps moves and win checks to a
+# handful of integer operations.
+#
+# The list board stays the public format: the notebook, the app and the
+# renderers index cells directly, and each search encodes its root board
+# once, so every node below it works on bitboards only.
+_H1 = ROWS + 1
+_BOTTOM_MASK = sum(1 << (col * _H1) for col in range(COLS))
+_BOARD_MASK = _BOTTOM_MASK * ((1 << ROWS) - 1)
+_CENTER_MASK = ((1 << ROWS) - 1) << (COLS // 2 * _H1)
+
+
+try:
+    _popcount = int.bit_count  # Python 3.10+
+except AttributeError:  # Python 3.9, which the notebook targets
+
+    def _popcount(stones: int) -> int:
+        """Number of set bits in `stones`."""
+        return bin(stones).count("1")
+
+
+def _cell_bit(row: int, col: int) -> int:
+    """Bit for a (row, col) cell of the list board (row 0 is the top)."""
+    return 1 << (col * _H1 + ROWS - 1 - row)
+
+
+_CELL_BITS: Tuple[Tuple[int, int, int], ...] = tuple(
+    (row, col, _cell_bit(row, col)) for row in range(ROWS) for col in range(COLS)
+)
+
+# Per-column bits used to play moves: a column is playable while its top cell
+# is free, and adding its bottom bit to `mask` fills the next empty cell.
+_COLUMN_BOTTOM_BITS: Tuple[int, ...] = tuple(_cell_bit(ROWS - 1, col) for col in range(COLS))
+_COLUMN_TOP_BITS: Tuple[int, ...] = tuple(_cell_bit(0, col) for col in range(COLS))
+
+
+_WINDOW_MASKS: Tuple[int, ...] = tuple(
+    sum(_cell_bit(row, col) for row, col in cells) for cells in ALL_WINDOWS
+)
+
+# Windows passing through each cell (at most 13 of the 69), keyed by cell bit.
+# Dropping a piece can only change the score of these windows.
+_WINDOWS_THROUGH: Dict[int, Tuple[int, ...]] = {
+    _cell_bit(row, col): tuple(w for w in _WINDOW_MASKS if w & _cell_bit(row, col))
+    for row in range(ROWS)
+    for col in range(COLS)
+}
+
+
+def board_to_bitboards(board: Sequence[Sequence[int]], piece: int) -> Tuple[int, int]:
+    """Encode a list board as `(position, mask)` with `piece` as the side to move."""
+    position = mask = 0
+    for row, col, bit in _CELL_BITS:
+        cell = board[row][col]
+        if cell != EMPTY:
+            mask |= bit
+            if cell == piece:
+                position |= bit
+    return position, mask
+
+
+def _bitboard_wins(stones: int) -> bool:
+    """True if `stones` contain four in a row (vertical, horizontal, both diagonals)."""
+    # Unrolled with literal shifts (1, _H1, _H1 - 1, _H1 + 1): this runs at
+    # every node, and a loop over a tuple of shifts is about a third slower
+    pairs = stones & (stones >> 1)
+    if pairs & (pairs >> 2):
+        return True
+    pairs = stones & (stones >> 7)
+    if pairs & (pairs >> 14):
+        return True
+    pairs = stones & (stones >> 6)
+    if pairs & (pairs >> 12):
+        return True
+    pairs = stones & (stones >> 8)
+    return bool(pairs & (pairs >> 16))
+
+
+def _bitboard_score(ai_stones: int, human_stones: int) -> int:
+    """Bitboard twin of score_position(board, AI)."""
+    score = _popcount(ai_stones & _CENTER_MASK) * 6
+    for window in _WINDOW_MASKS:
+        count_ai = _popcount(ai_stones & window)
+        count_human = _popcount(human_stones & window)
+        score += _COUNT_SCORES[count_ai * 5 + count_human]
+    return score
+
+
+def _score_delta(mover: int, other: int, bit: int, mover_is_ai: bool) -> int:
+    """Change in the AI score when the mover places a stone on `bit`."""
+    delta = 0
+    if mover_is_ai:
+        for window in _WINDOWS_THROUGH[bit]:
+            delta += _AI_DROP_DELTAS[_popcount(mover & window) * 5 + _popcount(other & window)]
+        if bit & _CENTER_MASK:
+            delta += 6
+    else:
+        for window in _WINDOWS_THROUGH[bit]:
+            delta += _HUMAN_DROP_DELTAS[_popcount(other & window) * 5 + _popcount(mover & window)]
+    return delta
+
+
+# --------------------------------------------------------------------------- #
+# Transposition table
+# --------------------------------------------------------------------------- #
+# Different move orders often reach the same position, so search results are
+# cached by position. Entries are (depth, value, flag, best_col), where `flag`
+# records whether `value` is exact or only a bound from an alpha-beta cut-off.
+# The default table lives at module level so work carries over between AI
+# turns (and, in the web app, across all sessions); callers can pass their own
+# dict instead.
+TT_EXACT: int = 0
+TT_LOWER: int = 1
+TT_UPPER: int = 2
+# About 190 bytes per entry, so a full table takes roughly 190 MB
+TT_MAX_ENTRIES: int = 1_000_000
+# Entries dropped at once when the table is full (least recently used first)
+TT_EVICT_BATCH: int = TT_MAX_ENTRIES // 4
+
+TTEntry = Tuple[int, float, int, Optional[int]]
+_TRANSPOSITION_TABLE: Dict[int, TTEntry] = {}
+
+# COLUMN_ORDER with one column moved to the front, for trying a cached best
+# move first. Precomputed so reordering costs nothing per node.
+_ORDER_WITH_FIRST: Tuple[Tuple[int, ...], ...] = tuple(
+    (first,) + tuple(col for col in COLUMN_ORDER if col != first)
+    for first in range(COLS)
+)
+
+
+def _tt_key(position: int, mask: int, color: int) -> int:
+    """Unique key per position: Pons' `position + mask` plus the side to move."""
+    return ((position + mask) << 1) | (color == 1)
+
+
+def _tt_store(tt: Dict[int, TTEntry], key: int, entry: TTEntry) -> None:
+    """Store an entry, keeping deeper results and bounding the table size."""
+    existing = tt.pop(key, None)
+    if existing is not None:
+        if existing[0] > entry[0]:
+            entry = existing  # Depth-preferred: keep the better-informed result
+    elif len(tt) >= TT_MAX_ENTRIES:
+        # Every visit re-inserts its entry at the end of the dict, so the
+        # front holds the least recently used ones. They are evicted in
+        # batches: removing one entry per store would make every
+        # `next(iter(tt))` skip over all the slots already deleted in front.
+        for old_key in list(islice(tt, TT_EVICT_BATCH)):
+            del tt[old_key]
+    tt[key] = entry
+
+
+def clear_transposition_table() -> None:
+    """Forget all cached search results."""
+    _TRANSPOSITION_TABLE.clear()
 
 
 # --------------------------------------------------------------------------- #
 # Minimax search
 # --------------------------------------------------------------------------- #
-def minimax(board: Sequence[Sequence[int]], depth: int, maximizing_player: bool) -> Tuple[int, Optional[int]]:
+# Wins and losses score beyond any heuristic value, offset by how early they
+# happen: a four made with fewer stones on the board is worth more, so the
+# AI takes the quickest win and drags out a loss. The offset depends only on
+# the position (not on the search depth), so cached TT values stay valid.
+WIN_SCORE: int = 1_000_000
+
+
+def _win_value(mask: int) -> int:
+    """Score for the side that completed a four in the position `mask`."""
+    return WIN_SCORE + ROWS * COLS - _popcount(mask)
+
+
+def is_win_score(score: float) -> bool:
+    """True when a search score is a proven win or loss rather than a heuristic."""
+    return abs(score) >= WIN_SCORE
+
+
+def _negamax(
+    position: int,
+    mask: int,
+    depth: int,
+    alpha: float,
+    beta: float,
+    color: int,
+    score: int,
+    tt: Dict[int, TTEntry],
+    killers: List[Optional[int]],
+    order: Sequence[int] = COLUMN_ORDER,
+) -> Tuple[float, Optional[int]]:
+    """
+    Alpha-beta negamax over bitboards.
+
+    Scores are relative to the side to move; `color` is +1 when that side is
+    the AI and -1 for the human, so leaf scores are `color * AI-score`.
+    Terminal positions score `-_win_value(mask)` for the side that lost.
+    `score` is the static AI score of this position, kept up to date move by
+    move so leaves never rescan the whole board. `order` is the column order
+    tried at this node (callers only change it at the root); a best move
+    remembered in the transposition table is tried first instead.
+    `killers[depth]` is the last column that caused a cut-off at this depth.
     """
-    Depth-limited minimax algorithm for Connect Four.
+    opponent = position ^ mask
+
+    # Only the player who just moved can have completed a line
+    if _bitboard_wins(opponent):
+        return (-_win_value(mask), None)
+    if mask == _BOARD_MASK:
+        return (0, None)  # Draw
+    if depth == 0:
+        return (color * score, None)
+
+    alpha_orig = alpha
+    key = _tt_key(position, mask, color)
+    entry = tt.get(key)
+    if entry is not None:
+        cached_depth, cached_value, flag, cached_col = entry
+        if cached_depth >= depth:
+            if flag == TT_LOWER:
+                alpha = max(alpha, cached_value)
+            elif flag == TT_UPPER:
+                beta = min(beta, cached_value)
+            if flag == TT_EXACT or alpha >= beta:
+                # Answered from the cache: mark the entry as recently used
+                del tt[key]
+                tt[key] = entry
+                return cached_value, cached_col
+        # Even a shallower result is a good guess at the best move: searching
+        # it first gives alpha-beta an early cut-off
+        if cached_col is not None and order[0] != cached_col:
+            if order is COLUMN_ORDER:
+                order = _ORDER_WITH_FIRST[cached_col]
+            else:
+                order = (cached_col,) + tuple(col for col in order if col != cached_col)
+    elif order is COLUMN_ORDER:
+        # No hash move: try the killer first, since a move that refuted one
+        # sibling position often refutes the others too
+        killer = killers[depth]
+        if killer is not None:
+            order = _ORDER_WITH_FIRST[killer]
+
+    value = -math.inf
+    best_col = None
+
+    # Children are derived from (position, mask) on the fly, so nothing is
+    # copied or undone and no per-node move list is built
+    for col in order:
+        if mask & _COLUMN_TOP_BITS[col]:
+            continue
+        child_mask = mask | (mask + _COLUMN_BOTTOM_BITS[col])
+        drop_bit = child_mask ^ mask
+        static_score = score + _score_delta(position, opponent, drop_bit, color == 1)
+
+        if depth == 1:
+            # Children are leaves: score them inline rather than paying for a
+            # Python call per leaf, which is most of the tree
+            if _bitboard_wins(position | drop_bit):
+                child_score = _win_value(child_mask)
+            elif child_mask == _BOARD_MASK:
+                child_score = 0
+            else:
+                child_score = color * static_score
+        else:
+            child_score, _ = _negamax(
+                opponent,
+                child_mask,
+                depth - 1,
+                -beta,
+                -alpha,
+                -color,
+                static_score,
+                tt,
+                killers,
+            )
+            child_score = -child_score
+
+        if child_score > value:
+            value = child_score
+            best_col = col
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            killers[depth] = col
+            break
+
+    if best_col is None:
+        # Every move loses: fall back to the first legal column, deterministically
+        best_col = next(col for col in order if not mask & _COLUMN_TOP_BITS[col])
+
+    if value <= alpha_orig:
+        flag = TT_UPPER
+    elif value >= beta:
+        flag = TT_LOWER
+    else:
+        flag = TT_EXACT
+    _tt_store(tt, key, (depth, value, flag, best_col))
+    return value, best_col
+
+
+def minimax(
+    board: Sequence[Sequence[int]],
+    depth: int,
+    maximizing_player: bool,
+    alpha: float = -math.inf,
+    beta: float = math.inf,
+    first_col: Optional[int] = None,
+    tt: Optional[Dict[int, TTEntry]] = None,
+) -> Tuple[float, Optional[int]]:
+    """
+    Depth-limited minimax with alpha-beta pruning for Connect Four.
     
+    The board is encoded as bitboards once and searched in negamax form;
+    scores are always reported from the AI's point of view. Results are
+    cached in a transposition table across calls.
+
     Args:
         board: Current game board state.
         depth: Remaining search depth.
         maximizing_player: True if maximizing (AI), False if minimizing (Human).
+        alpha: Best score the maximizer can already guarantee.
+        beta: Best score the minimizer can already guarantee.
+        first_col: Column to search first at the root (e.g. the best move
+            from a shallower search), ahead of COLUMN_ORDER.
+        tt: Transposition table to use; defaults to the module-level one.
         
     Returns:
         Tuple of (score, best_column). Column is None for terminal/leaf nodes.
+        Proven wins and losses score at least WIN_SCORE in magnitude (see
+        `is_win_score`), larger the sooner they happen.
     """
-    valid_locations = get_valid_locations(board)
-    terminal = is_terminal_node(board)
-
-    # Base case: terminal node or max depth reached
-    if depth == 0 or terminal:
-        if terminal:
-            if winning_move(board, AI):
-                return (math.inf, None)
-            if winning_move(board, HUMAN):
-                return (-math.inf, None)
-            return (0, None)  # Draw
-        return (score_position(board, AI), None)
-
-    # Determine player piece and initial value based on player type
     piece = AI if maximizing_player else HUMAN
-    value = -math.inf if maximizing_player else math.inf
-    best_col = random.choice(valid_locations) if valid_locations else None
+    color = 1 if maximizing_player else -1
+    position, mask = board_to_bitboards(board, piece)
+
+    # A line already made by the side to move (only on hand-built boards).
+    # Everything else terminal is detected inside _negamax, which checks only
+    # the player who just moved: one win test per node instead of two.
+    if _bitboard_wins(position):
+        return (color * _win_value(mask), None)
+
+    # Full evaluation happens once here; the search updates it incrementally
+    opponent = position ^ mask
+    if maximizing_player:
+        window = (alpha, beta)
+        score = _bitboard_score(position, opponent)
+    else:
+        window = (-beta, -alpha)
+        score = _bitboard_score(opponent, position)
+    if first_col is not None:
+        order = _ORDER_WITH_FIRST[first_col]
+    else:
+        order = _root_order(position, mask, color)
+    if tt is None:
+        tt = _TRANSPOSITION_TABLE
+    killers: List[Optional[int]] = [None] * (depth + 1)
+    value, best_col = _negamax(
+        position, mask, depth, *window, color, score, tt, killers, order
+    )
+    return color * value, best_col
+
+
+def _root_order(position: int, mask: int, color: int) -> Tuple[int, ...]:
+    """
+    Legal root columns sorted by the static score of the move, best first.
 
-    # Evaluate all valid moves
-    for col in valid_locations:
-        row = get_next_open_row(board, col)
-        if row is None:
+    One cheap evaluation per root child gives alpha-beta a good first guess
+    at the root, where a strong early move narrows the window for all the
+    siblings. Ties keep COLUMN_ORDER. Only used without a `first_col` hint:
+    iterative deepening already leads with the previous iteration's best.
+    """
+    opponent = position ^ mask
+    gains: Dict[int, int] = {}
+    for col in COLUMN_ORDER:
+        if mask & _COLUMN_TOP_BITS[col]:
             continue
-        
-        # Make move on copy of board
-        board_copy = copy_board(board)
-        drop_piece(board_copy, row, col, piece)
-        new_score, _ = minimax(board_copy, depth - 1, not maximizing_player)
-        
-        # Update best move based on player type
-        if maximizing_player:
-            if new_score > value:
-                value = new_score
-                best_col = col
-        else:
-            if new_score < value:
-                value = new_score
-                best_col = col
+        drop_bit = (mask | (mask + _COLUMN_BOTTOM_BITS[col])) ^ mask
+        gains[col] = color * _score_delta(position, opponent, drop_bit, color == 1)
+    return tuple(sorted(gains, key=gains.__getitem__, reverse=True))
 
-    return value, best_col
 
+def tactical_move(board: Sequence[Sequence[int]]) -> Optional[int]:
+    """
+    Return an immediately decisive column for the AI, if any.
+
+    A winning drop is preferred; otherwise a column that blocks a human
+    four-in-a-row on the next move. Returns None when neither exists. This is
+    a handful of bitboard tests, far cheaper than a full search.
+    """
+    ai_stones, mask = board_to_bitboards(board, AI)
+    human_stones = ai_stones ^ mask
+    for stones in (ai_stones, human_stones):
+        for col in COLUMN_ORDER:
+            if mask & _COLUMN_TOP_BITS[col]:
+                continue
+            drop_bit = (mask | (mask + _COLUMN_BOTTOM_BITS[col])) ^ mask
+            if _bitboard_wins(stones | drop_bit):
+                return col
+    return None
+
+
+def _choose_root_column(board: Sequence[Sequence[int]], candidate: Optional[int]) -> int:
+    """Final AI pick: the searched column, or the first legal one without it."""
+    # Kept even when every move loses: losses score by their distance (see
+    # _win_value), so the searched column is the slowest defeat. Nothing here
+    # is random, so a position always gets the same move.
+    if candidate is not None:
+        return candidate
+    valid = get_valid_locations(board)
+    return valid[0] if valid else 0
+
+
+def ai_decide_move(
+    board: Sequence[Sequence[int]],
+    depth: int = 3,
+    tt: Optional[Dict[int, TTEntry]] = None,
+) -> int:
+    """Return the column chosen by the AI."""
+    forced = tactical_move(board)
+    if forced is not None:
+        return forced
+
+    _, candidate = minimax(
+        board,
+        depth=depth,
+        maximizing_player=True,
+        alpha=-math.inf,
+        beta=math.inf,
+        tt=tt,
+    )
+    return _choose_root_column(board, candidate)
+
+
+def ai_decide_move_iter(
+    board: Sequence[Sequence[int]],
+    max_depth: int = 3,
+    time_budget_ms: Optional[float] = None,
+    tt: Optional[Dict[int, TTEntry]] = None,
+) -> int:
+    """
+    Iterative-deepening variant of `ai_decide_move`.
+
+    Searches depth 1, 2, ... up to `max_depth`, trying the previous
+    iteration's best column first so alpha-beta sees its strongest candidate
+    immediately. Shallow iterations are cheap, and they leave their results in
+    the transposition table. Stops early once the outcome is forced (a win or
+    loss was proven) or when the next iteration would likely overrun
+    `time_budget_ms`. The budget is checked between iterations, so the last
+    one always completes.
+    """
+    return _iterative_deepening(
+        board,
+        max_depth,
+        time_budget_ms,
+        lambda depth, first_col: minimax(
+            board, depth, maximizing_player=True, first_col=first_col, tt=tt
+        ),
+    )
+
+
+def _iterative_deepening(
+    board: Sequence[Sequence[int]],
+    max_depth: int,
+    time_budget_ms: Optional[float],
+    search: Callable[[int, Optional[int]], Tuple[float, Optional[int]]],
+) -> int:
+    """
+    Deepening loop behind `ai_decide_move_iter`, shared by the search backends.
 
-def ai_decide_move(board: Sequence[Sequence[int]], depth: int = 3) -> int:
-    """Return the column chosen by the AI (falls back to random if needed)."""
-    _, candidate = minimax(board, depth=depth, maximizing_player=True)
-    if candidate is None:
-        valid = get_valid_locations(board)
-        return random.choice(valid) if valid else 0
-    return candidate
+    `search(depth, first_col)` runs one AI-to-move search and returns
+    `(score, best_col)`, like `minimax`.
+    """
+    forced = tactical_move(board)
+    if forced is not None:
+        return forced
+
+    # Each iteration costs more than all the previous ones together, so one
+    # started after half the budget would probably run past the end of it
+    cutoff = None
+    if time_budget_ms is not None:
+        cutoff = time.monotonic() + time_budget_ms / 2000
+
+    score: float = 0
+    best_col: Optional[int] = None
+    for depth in range(1, max_depth + 1):
+        score, col = search(depth, best_col)
+        if col is not None:
+            best_col = col
+        if is_win_score(score):
+            break
+        if cutoff is not None and time.monotonic() >= cutoff:
+            break
+
+    return _choose_root_column(board, best_col)
 
 
 # --------------------------------------------------------------------------- #
 # Rendering helpers
 # --------------------------------------------------------------------------- #
+# Board HTML pieces that never change: the column labels and the three
+# possible cells, so rendering is one lookup per cell
+_BOARD_LABELS_HTML = (
+    "<table class='board-labels-table' style='border-collapse: collapse; margin: 0 auto 8px auto;'>"
+    "<tr>"
+    + "".join(
+        "<td style='width: 50px; height: 30px; text-align: center; "
+        "font-weight: bold; font-size: 1.1rem; color: #4455aa; "
+        "border: none; padding: 0;'>"
+        f"{col}</td>"
+        for col in range(COLS)
+    )
+    + "</tr>"
+    "</table>"
+)
+_CELL_HTML: Dict[int, str] = {
+    piece: (
+        "<td style='border: 2px solid #333; width: 50px; height: 50px; "
+        "text-align: center; font-size: 24px;'>"
+        f"{token}</td>"
+    )
+    for piece, token in TOKEN_MAP.items()
+}
+
+
 def board_to_html(board: Sequence[Sequence[int]]) -> str:
     """Render the board as HTML table (mirrors notebook styling)."""
     html = []
     html.append("<div class='board-table-wrapper' style='display: inline-block;'>")
     
     # Column labels at the top using table structure for perfect alignment
-    html.append("<table class='board-labels-table' style='border-collapse: collapse; margin: 0 auto 8px auto;'>")
-    html.append("<tr>")
-    for col in range(COLS):
-        html.append(
-            "<td style='width: 50px; height: 30px; text-align: center; "
-            "font-weight: bold; font-size: 1.1rem; color: #4455aa; "
-            "border: none; padding: 0;'>"
-            f"{col}</td>"
-        )
-    html.append("</tr>")
-    html.append("</table>")
+    html.append(_BOARD_LABELS_HTML)
     
     # Game board table
     html.append("<table class='board-game-table' style='border-collapse: collapse; margin: 0 auto;'>")
-    for row in range(ROWS):
+    for row in board:
         html.append("<tr>")
-        for col in range(COLS):
-            token = TOKEN_MAP[board[row][col]]
-            html.append(
-                "<td style='border: 2px solid #333; width: 50px; height: 50px; "
-                "text-align: center; font-size: 24px;'>"
-                f"{token}</td>"
-            )
+        html.extend(map(_CELL_HTML.__getitem__, row))
         html.append("</tr>")
     html.append("</table>")
     html.append("</div>")
 
     return "".join(html)
-
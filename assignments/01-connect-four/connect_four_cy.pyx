@@ -0,0 +1,220 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython-compiled variant of the Connect Four search.
+
+Same bitboard negamax as `connect_four_core` (and `connect_four_numba`), but
+with C-typed 64-bit integers, fixed-size C arrays and `cdef` functions, so
+the whole search runs without touching Python objects. The lookup tables
+are copied from the core at import, keeping one definition of the heuristic.
+
+Build in place with:
+
+    python setup.py build_ext --inplace
+
+then `import connect_four_cy` exposes the same `minimax` / `ai_decide_move`
+surface as the core.
+"""
+
+import math
+
+import connect_four_core as core
+
+ctypedef unsigned long long u64
+
+cdef extern from *:
+    int __builtin_popcountll(unsigned long long) nogil
+    int __builtin_ctzll(unsigned long long) nogil
+
+# Board geometry is fixed at compile time so the C compiler can fold it
+cdef enum:
+    COLS = 7
+    H1 = 7
+    N_CELLS = 49
+    N_WINDOWS = 69
+    MAX_THROUGH = 16
+    N_STONES = 42
+    WIN_SCORE = 1000000
+    INF = WIN_SCORE + N_STONES + 1
+
+cdef u64 BOARD_MASK = core._BOARD_MASK
+cdef u64 CENTER_MASK = core._CENTER_MASK
+cdef int ORDER[COLS]
+cdef u64 BOTTOM_BITS[COLS]
+cdef u64 TOP_BITS[COLS]
+cdef u64 WINDOW_MASKS[N_WINDOWS]
+cdef u64 WINDOWS_THROUGH[N_CELLS][MAX_THROUGH]
+cdef int WINDOWS_THROUGH_COUNT[N_CELLS]
+cdef int COUNT_SCORES[25]
+cdef int AI_DROP_DELTAS[25]
+cdef int HUMAN_DROP_DELTAS[25]
+
+
+def _load_tables():
+    """Copy the core's precomputed tables into the C arrays above."""
+    cdef int i, k
+    assert core.COLS == COLS and core._H1 == H1 and len(core._WINDOW_MASKS) == N_WINDOWS
+    assert core.ROWS * core.COLS == N_STONES and core.WIN_SCORE == WIN_SCORE
+    for i in range(COLS):
+        ORDER[i] = core.COLUMN_ORDER[i]
+        BOTTOM_BITS[i] = core._COLUMN_BOTTOM_BITS[i]
+        TOP_BITS[i] = core._COLUMN_TOP_BITS[i]
+    for i in range(N_WINDOWS):
+        WINDOW_MASKS[i] = core._WINDOW_MASKS[i]
+    for i in range(N_CELLS):
+        WINDOWS_THROUGH_COUNT[i] = 0
+    for bit, windows in core._WINDOWS_THROUGH.items():
+        i = bit.bit_length() - 1
+        WINDOWS_THROUGH_COUNT[i] = len(windows)
+        for k in range(len(windows)):
+            WINDOWS_THROUGH[i][k] = windows[k]
+    for i in range(25):
+        COUNT_SCORES[i] = core._COUNT_SCORES[i]
+        AI_DROP_DELTAS[i] = core._AI_DROP_DELTAS[i]
+        HUMAN_DROP_DELTAS[i] = core._HUMAN_DROP_DELTAS[i]
+
+
+_load_tables()
+
+
+cdef inline int win_value(u64 mask) nogil:
+    return WIN_SCORE + N_STONES - __builtin_popcountll(mask)
+
+
+cdef inline bint bitboard_wins(u64 stones) nogil:
+    cdef u64 pairs
+    pairs = stones & (stones >> 1)
+    if pairs & (pairs >> 2):
+        return True
+    pairs = stones & (stones >> H1)
+    if pairs & (pairs >> (2 * H1)):
+        return True
+    pairs = stones & (stones >> (H1 - 1))
+    if pairs & (pairs >> (2 * (H1 - 1))):
+        return True
+    pairs = stones & (stones >> (H1 + 1))
+    if pairs & (pairs >> (2 * (H1 + 1))):
+        return True
+    return False
+
+
+cdef int bitboard_score(u64 ai_stones, u64 human_stones) nogil:
+    cdef int score = __builtin_popcountll(ai_stones & CENTER_MASK) * 6
+    cdef int i
+    for i in range(N_WINDOWS):
+        score += COUNT_SCORES[
+            __builtin_popcountll(ai_stones & WINDOW_MASKS[i]) * 5
+            + __builtin_popcountll(human_stones & WINDOW_MASKS[i])
+        ]
+    return score
+
+
+cdef inline int score_delta(u64 mover, u64 other, u64 bit, bint mover_is_ai) nogil:
+    cdef int index = __builtin_ctzll(bit)
+    cdef int delta = 0
+    cdef int k
+    cdef u64 window
+    for k in range(WINDOWS_THROUGH_COUNT[index]):
+        window = WINDOWS_THROUGH[index][k]
+        if mover_is_ai:
+            delta += AI_DROP_DELTAS[
+                __builtin_popcountll(mover & window) * 5 + __builtin_popcountll(other & window)
+            ]
+        else:
+            delta += HUMAN_DROP_DELTAS[
+                __builtin_popcountll(other & window) * 5 + __builtin_popcountll(mover & window)
+            ]
+    if mover_is_ai and bit & CENTER_MASK:
+        delta += 6
+    return delta
+
+
+cdef int negamax(
+    u64 position, u64 mask, int depth, int alpha, int beta, int color, int score, int* best_out
+) nogil:
+    """C twin of connect_four_core._negamax (no transposition table)."""
+    cdef u64 opponent = position ^ mask
+    cdef u64 child_mask, drop_bit
+    cdef int value = -INF
+    cdef int best_col = -1
+    cdef int i, col, child_score, static_score, ignored
+
+    best_out[0] = -1
+    if bitboard_wins(opponent):
+        return -win_value(mask)
+    if mask == BOARD_MASK:
+        return 0
+    if depth == 0:
+        return color * score
+
+    for i in range(COLS):
+        col = ORDER[i]
+        if mask & TOP_BITS[col]:
+            continue
+        child_mask = mask | (mask + BOTTOM_BITS[col])
+        drop_bit = child_mask ^ mask
+        static_score = score + score_delta(position, opponent, drop_bit, color == 1)
+        child_score = -negamax(
+            opponent, child_mask, depth - 1, -beta, -alpha, -color, static_score, &ignored
+        )
+        if child_score > value:
+            value = child_score
+            best_col = col
+        if value > alpha:
+            alpha = value
+        if alpha >= beta:
+            break
+
+    best_out[0] = best_col
+    return value
+
+
+def minimax(
+    board,
+    int depth,
+    bint maximizing_player,
+    alpha=-math.inf,
+    beta=math.inf,
+    first_col=None,
+    tt=None,
+):
+    """
+    Drop-in replacement for `connect_four_core.minimax` using the C search.
+
+    Takes the same arguments, but the C search has no transposition table
+    and a fixed column order, so `tt` and the `first_col` ordering hint are
+    accepted and ignored (neither changes the result).
+    """
+    cdef int color = 1 if maximizing_player else -1
+    cdef u64 position, mask, opponent
+    cdef int score, value, best_col, low, high
+
+    piece = core.AI if maximizing_player else core.HUMAN
+    py_position, py_mask = core.board_to_bitboards(board, piece)
+    position = py_position
+    mask = py_mask
+    if bitboard_wins(position):
+        return (color * win_value(mask), None)
+
+    # Scores are integers, so rounding the bounds outwards keeps the same
+    # cut-offs; infinite bounds become INF, which no score reaches
+    low = -INF if alpha <= -INF else math.floor(alpha)
+    high = INF if beta >= INF else math.ceil(beta)
+    opponent = position ^ mask
+    if maximizing_player:
+        score = bitboard_score(position, opponent)
+    else:
+        score = bitboard_score(opponent, position)
+        low, high = -high, -low
+    with nogil:
+        value = negamax(position, mask, depth, low, high, color, score, &best_col)
+    return color * value, (best_col if best_col >= 0 else None)
+
+
+def ai_decide_move(board, int depth=3, tt=None):
+    """Return the column chosen by the compiled AI (`tt` is ignored, as for `minimax`)."""
+    forced = core.tactical_move(board)
+    if forced is not None:
+        return forced
+
+    _, candidate = minimax(board, depth, True)
+    return core._choose_root_column(board, candidate)
@@ -0,0 +1,17 @@
+"""
+Build script for the optional Cython search extension.
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+This compiles `connect_four_cy.pyx` next to the sources; nothing else in the
+assignment needs building.
+"""
+
+from Cython.Build import cythonize
+from setuptools import setup
+
+setup(
+    name="connect-four-search",
+    ext_modules=cythonize("connect_four_cy.pyx", language_level=3),
+)
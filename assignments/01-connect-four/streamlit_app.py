@@ -1,13 +1,16 @@
 """Streamlit web application for Connect Four game with Minimax AI."""
 
-import random
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Sequence, Tuple
 
 import streamlit as st
 
 from connect_four_core import (
     AI,
+    COLS,
     HUMAN,
-    ai_decide_move,
     board_full,
     board_to_html,
     create_board,
@@ -15,10 +18,27 @@ from connect_four_core import (
     get_next_open_row,
     get_valid_locations,
     is_valid_location,
+    tactical_move,
     winning_move,
 )
 
 # Constants
+# The AI deepens its search move by move until the time budget runs out
+AI_MAX_DEPTH = 12
+AI_TIME_BUDGET_MS = 500
+# How often (seconds) the page checks whether the background search is done
+AI_POLL_INTERVAL = 0.2
+
+# Boards are cached by their 42 cells packed into bytes (see _board_key)
+BoardKey = bytes
+# Rendered boards kept for all sessions (about 6 KB each)
+BOARD_HTML_CACHE_SIZE = 4096
+
+# Column button labels and widget keys; the board is always COLS wide
+COLUMN_BUTTON_LABELS = tuple(str(col) for col in range(COLS))
+COLUMN_BUTTON_KEYS = tuple(f"col_{col}" for col in range(COLS))
+DISABLED_BUTTON_LABEL = "—"
+
 INITIAL_MESSAGE = (
     "<h3>🎮 Connect Four Game</h3>"
     "<p>👤 Your turn! Click a column to drop your piece.</p>"
@@ -46,6 +66,14 @@ DRAW_MESSAGE = (
     "<h3>🤝 IT'S A DRAW! 🤝</h3>"
     "<p>The board is full — great game!</p>"
 )
+AI_THINKING_MESSAGE = (
+    "<h3>🤖 Computer is thinking…</h3>"
+    "<p>Hang tight, the AI is searching for its move.</p>"
+)
+AI_PLAYED_MESSAGE_TEMPLATE = (
+    "<h3>🤖 Computer played column {column}</h3>"
+    "<p>👤 Your turn! Pick your next column.</p>"
+)
 
 # CSS Styles
 CSS_STYLES = """
@@ -178,7 +206,7 @@ INFO_CARD_HTML = """
     <ul>
         <li>Drop discs to connect four in a row.</li>
         <li>Use the drop buttons to pick a column.</li>
-        <li>Yellow AI responds instantly using depth-3 Minimax.</li>
+        <li>Yellow AI responds within half a second using iterative-deepening Minimax with alpha-beta pruning.</li>
         <li>The match ends when someone connects four or the grid fills up.</li>
     </ul>
     <span>Tip: claim the center column to create multiple threats.</span>
@@ -192,6 +220,36 @@ GAME_HEADER_HTML = """
 </div>
 """
 
+# The spacer sits between the status box and the New Game button; it is
+# written with the status box so the column takes one markdown element
+STATUS_BOX_TEMPLATE = (
+    '<div class="status-box">{message}</div>'
+    "<div style='margin-top:1rem;'></div>"
+)
+BOARD_WRAPPER_TEMPLATE = (
+    '<div class="board-wrapper"><div class="board-container">{board}</div></div>'
+)
+# Styles and header go out as a single element at the top of the page. It
+# has to be re-sent on every rerun (Streamlit drops elements a run does not
+# write), so the stylesheet's indentation and line breaks are squeezed out
+# once here to keep that message small.
+PAGE_HEADER_HTML = " ".join(CSS_STYLES.split()) + GAME_HEADER_HTML
+
+
+def _board_key(board: Sequence[Sequence[int]]) -> BoardKey:
+    """
+    Hashable cache key for a board: one byte per cell, row by row.
+
+    A flat bytes object hashes in one step, where a tuple of tuples is
+    walked element by element (notably by st.cache_data's hasher).
+    """
+    return b"".join(map(bytes, board))
+
+
+def _board_from_key(board_key: BoardKey) -> List[List[int]]:
+    """Rebuild the list board from `_board_key` output."""
+    return [list(board_key[i : i + COLS]) for i in range(0, len(board_key), COLS)]
+
 
 def init_game_state() -> None:
     """Initialize the game state in Streamlit session state."""
@@ -201,10 +259,22 @@ def init_game_state() -> None:
         st.session_state.game_over = False
         st.session_state.message = INITIAL_MESSAGE
         st.session_state.last_ai_column = None
+        st.session_state.decide = _new_decider()
+        st.session_state.ai_future = None
 
 
 def reset_game_state() -> None:
     """Reset the game to initial state."""
+    # The decider and the shared transposition table are kept, so replayed
+    # openings are answered from cache. The old game's search is dropped: cancelled if
+    # it is still queued and no other session waits for it, otherwise simply
+    # ignored. The board cannot change while the AI thinks, so it still
+    # identifies the search.
+    if st.session_state.ai_future is not None:
+        _get_searches().release(
+            _board_key(st.session_state.board), st.session_state.ai_future
+        )
+    st.session_state.ai_future = None
     st.session_state.board = create_board()
     st.session_state.turn = HUMAN
     st.session_state.game_over = False
@@ -228,19 +298,20 @@ def human_move(column: int) -> bool:
     Returns:
         True if the move was successful, False otherwise.
     """
-    if st.session_state.game_over or st.session_state.turn != HUMAN:
+    state = st.session_state
+    if state.game_over or state.turn != HUMAN:
         return False
 
-    board = st.session_state.board
-    st.session_state.last_ai_column = None
+    board = state.board
+    state.last_ai_column = None
 
     if not is_valid_location(board, column):
-        st.session_state.message = INVALID_MOVE_MESSAGE
+        state.message = INVALID_MOVE_MESSAGE
         return False
 
     row = get_next_open_row(board, column)
     if row is None:
-        st.session_state.message = COLUMN_FULL_MESSAGE
+        state.message = COLUMN_FULL_MESSAGE
         return False
 
     drop_piece(board, row, column, HUMAN)
@@ -253,29 +324,182 @@ def human_move(column: int) -> bool:
         set_game_over_message(DRAW_MESSAGE)
         return True
 
-    st.session_state.turn = AI
+    state.turn = AI
+    start_ai_move()
     return True
 
 
+@st.cache_resource
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Worker pool for AI searches, shared by all sessions.
+
+    Searches run off the script thread so a thinking AI never blocks the page
+    (or other sessions). Streamlit re-executes this script on every rerun, so
+    the pool is kept by st.cache_resource instead of a module-level global.
+    """
+    return ThreadPoolExecutor(max_workers=2)
+
+
+class SharedSearches:
+    """
+    AI searches in flight, keyed by board and shared by all sessions.
+
+    Sessions that reach the same position while it is being searched (the
+    opening moves, above all) wait on the same future instead of queueing
+    the same search again, so a burst of players costs one search per
+    position. A search is only cancelled once no session waits for it.
+    """
+
+    def __init__(self) -> None:
+        # Re-entrant: a future that is already done runs its done-callback
+        # (which takes the lock) straight away, inside `submit`
+        self._lock = threading.RLock()
+        # board -> (future, number of sessions waiting for it)
+        self._searches: Dict[BoardKey, Tuple[Future, int]] = {}
+
+    def submit(
+        self, board_key: BoardKey, decide: Callable[[BoardKey, int], int]
+    ) -> Future:
+        """Return the search for `board_key`, starting it with `decide` if needed."""
+        with self._lock:
+            future, waiters = self._searches.get(board_key, (None, 0))
+            if future is None:
+                future = _get_executor().submit(decide, board_key, AI_MAX_DEPTH)
+                future.add_done_callback(lambda done: self._finish(board_key, done))
+            if not future.done():
+                self._searches[board_key] = (future, waiters + 1)
+            return future
+
+    def release(self, board_key: BoardKey, future: Future) -> None:
+        """Stop waiting for `future`; cancel the search if nobody else is."""
+        with self._lock:
+            current, waiters = self._searches.get(board_key, (None, 0))
+            if current is not future:
+                # Already finished; the entry may now be another search for
+                # the same board, which is not ours to release
+                return
+            if waiters > 1:
+                self._searches[board_key] = (future, waiters - 1)
+                return
+            del self._searches[board_key]
+        future.cancel()
+
+    def _finish(self, board_key: BoardKey, future: Future) -> None:
+        with self._lock:
+            if self._searches.get(board_key, (None, 0))[0] is future:
+                del self._searches[board_key]
+
+
+@st.cache_resource
+def _get_search_lock() -> threading.Lock:
+    """
+    Held for the whole of each AI search.
+
+    Every search uses the backend's process-wide transposition table (one
+    bounded table for all sessions and games, with least-recently-used
+    eviction), and the pure-Python one is a dict that must not be changed
+    by two workers at once. The GIL would interleave the searches anyway,
+    so running them one after the other costs no throughput.
+    """
+    return threading.Lock()
+
+
+@st.cache_resource
+def _get_searches() -> SharedSearches:
+    """The process-wide table of in-flight searches (see SharedSearches)."""
+    return SharedSearches()
+
+
+def _search_backend():
+    """
+    The AI search module, imported on first use.
+
+    connect_four_numba runs the compiled search when Numba is installed and
+    the pure-Python core otherwise. Importing it pulls in NumPy and Numba,
+    so it is only loaded from worker threads, never before the first paint.
+    """
+    import connect_four_numba
+
+    return connect_four_numba
+
+
+@st.cache_resource(show_spinner=False)
+def _warm_up_search() -> None:
+    """Import and compile the search in the background, once per server process."""
+    _get_executor().submit(lambda: _search_backend().warm_up())
+
+
+def _new_decider() -> Callable[[BoardKey, int], int]:
+    """
+    Build a memoised AI decision function for one session.
+
+    Results are cached per board, so a re-rendered position is never
+    searched twice. Everything it needs is captured here, so it can run in a
+    worker thread without touching session state.
+    """
+
+    @functools.lru_cache(maxsize=65536)
+    def decide(board_key: BoardKey, max_depth: int) -> int:
+        board = _board_from_key(board_key)
+        with _get_search_lock():
+            return _search_backend().ai_decide_move_iter(
+                board, max_depth=max_depth, time_budget_ms=AI_TIME_BUDGET_MS
+            )
+
+    return decide
+
+
+def start_ai_move() -> None:
+    """Start the AI's search in the background; `ai_move` applies the result."""
+    board = st.session_state.board
+    forced = tactical_move(board)
+    if forced is not None:
+        # An immediate win or block needs no search: a future that is already
+        # done lets `ai_move` play it in this same run, without polling
+        future: Future = Future()
+        future.set_result(forced)
+        st.session_state.ai_future = future
+        return
+
+    st.session_state.ai_future = _get_searches().submit(
+        _board_key(board), st.session_state.decide
+    )
+    st.session_state.message = AI_THINKING_MESSAGE
+
+
 def ai_move() -> None:
-    """Process the AI's move using Minimax algorithm."""
-    if st.session_state.game_over or st.session_state.turn != AI:
+    """Play the AI's move once its background Minimax search has finished."""
+    state = st.session_state
+    future = state.ai_future
+    if future is None or not future.done():
         return
+    state.ai_future = None
 
-    board = st.session_state.board
-    column = ai_decide_move(board, depth=3)
-    row = get_next_open_row(board, column)
+    if state.game_over or state.turn != AI:
+        return
+
+    if future.cancelled():
+        # Shared searches are only cancelled once nobody waits for them, but
+        # never leave the AI without a move: search again
+        start_ai_move()
+        return
+
+    board = state.board
+    # A failed search falls back to the first legal column below
+    column = future.result() if future.exception() is None else None
+    row = None if column is None else get_next_open_row(board, column)
     
     if row is None:
         valid = get_valid_locations(board)
         if not valid:
             set_game_over_message(DRAW_MESSAGE)
             return
-        column = random.choice(valid)
+        column = valid[0]  # get_valid_locations is centre-first
         row = get_next_open_row(board, column)
 
     drop_piece(board, row, column, AI)
-    st.session_state.last_ai_column = column + 1
+    state.last_ai_column = column + 1
 
     if winning_move(board, AI):
         set_game_over_message(AI_WIN_MESSAGE)
@@ -285,25 +509,40 @@ def ai_move() -> None:
         set_game_over_message(DRAW_MESSAGE)
         return
 
-    st.session_state.turn = HUMAN
-    st.session_state.message = (
-        f"<h3>🤖 Computer played column {st.session_state.last_ai_column}</h3>"
-        "<p>👤 Your turn! Pick your next column.</p>"
-    )
+    state.turn = HUMAN
+    state.message = AI_PLAYED_MESSAGE_TEMPLATE.format(column=state.last_ai_column)
 
 
-def render_status(status_placeholder) -> None:
+def render_status(status_col) -> None:
     """Render the game status message."""
-    status_placeholder.markdown(
-        f'<div class="status-box">{st.session_state.message}</div>',
+    status_col.markdown(
+        STATUS_BOX_TEMPLATE.format(message=st.session_state.message),
         unsafe_allow_html=True,
     )
 
 
-def render_board(board_placeholder) -> None:
+@st.cache_data(max_entries=BOARD_HTML_CACHE_SIZE, show_spinner=False)
+def _board_html_cached(board_key: BoardKey) -> str:
+    """
+    Board HTML per position; reruns mostly redraw an unchanged board.
+
+    Cached with st.cache_data rather than functools.lru_cache because the
+    script (and any module-level cache in it) is re-executed on every rerun.
+    The cache is shared by all sessions and kept across games, so common
+    openings are rendered once per server.
+    """
+    return BOARD_WRAPPER_TEMPLATE.format(board=board_to_html(_board_from_key(board_key)))
+
+
+def render_html(board) -> str:
+    """Wrapped board HTML, built once per distinct position."""
+    return _board_html_cached(_board_key(board))
+
+
+def render_board(board_container) -> None:
     """Render the game board."""
-    board_placeholder.markdown(
-        f'<div class="board-wrapper"><div class="board-container">{board_to_html(st.session_state.board)}</div></div>',
+    board_container.markdown(
+        render_html(st.session_state.board),
         unsafe_allow_html=True,
     )
 
@@ -311,27 +550,38 @@ def render_board(board_placeholder) -> None:
 def render_buttons(board_container) -> None:
     """Render the column selection buttons."""
     with board_container:
-        cols = len(st.session_state.board[0])
-        button_cols = st.columns(cols, gap="small")
+        board = st.session_state.board
+        button_cols = st.columns(COLS, gap="small")
+        # Looked up once per render rather than once per button
+        valid_columns = frozenset(get_valid_locations(board))
+        locked = st.session_state.game_over or st.session_state.turn != HUMAN
         
         for idx, column in enumerate(button_cols):
-            disabled = (
-                st.session_state.game_over
-                or st.session_state.turn != HUMAN
-                or not is_valid_location(st.session_state.board, idx)
-            )
-            button_text = str(idx) if not disabled else "—"
+            disabled = locked or idx not in valid_columns
+            button_text = DISABLED_BUTTON_LABEL if disabled else COLUMN_BUTTON_LABELS[idx]
             
-            if column.button(button_text, key=f"col_{idx}", disabled=disabled):
-                moved = human_move(idx)
-                if moved and not st.session_state.game_over:
-                    ai_move()
-                st.rerun()
+            # The move is applied in an on_click callback, which Streamlit runs
+            # before the script, so a single run already shows its result
+            column.button(
+                button_text,
+                key=COLUMN_BUTTON_KEYS[idx],
+                disabled=disabled,
+                on_click=human_move,
+                args=(idx,),
+            )
+
+
+@st.fragment(run_every=AI_POLL_INTERVAL)
+def wait_for_ai_move() -> None:
+    """While the AI is thinking, poll its search and rerun the page when done."""
+    future = st.session_state.ai_future
+    if future is None or future.done():
+        st.rerun()
 
 
 def render_game_header() -> None:
-    """Render the game header."""
-    st.markdown(GAME_HEADER_HTML, unsafe_allow_html=True)
+    """Inject the page styles and render the game header."""
+    st.markdown(PAGE_HEADER_HTML, unsafe_allow_html=True)
 
 
 def render_info_card(info_col) -> None:
@@ -341,12 +591,14 @@ def render_info_card(info_col) -> None:
 
 
 def render_new_game_button(status_col) -> None:
-    """Render the new game button."""
+    """
+    Render the new game button.
+
+    The reset runs as an on_click callback, before the script, so the run
+    triggered by the click already shows the new game.
+    """
     with status_col:
-        st.markdown("<div style='margin-top:1rem;'></div>", unsafe_allow_html=True)
-        if st.button("🔄 New Game", use_container_width=True):
-            reset_game_state()
-            st.rerun()
+        st.button("🔄 New Game", use_container_width=True, on_click=reset_game_state)
 
 
 def main() -> None:
@@ -358,25 +610,31 @@ def main() -> None:
         initial_sidebar_state="collapsed",
     )
 
-    st.markdown(CSS_STYLES, unsafe_allow_html=True)
     render_game_header()
     init_game_state()
+    _warm_up_search()
+    ai_move()
 
     # Create layout columns
     status_col, board_col, info_col = st.columns([1.15, 2.2, 1.15], gap="large")
 
-    # Create placeholders for dynamic content
-    status_placeholder = status_col.empty()
     board_container = board_col.container()
-    board_placeholder = board_container.empty()
 
-    # Render UI components
-    render_status(status_placeholder)
-    render_board(board_placeholder)
+    # Render UI components. Every element is written on every run: Streamlit
+    # drops elements a rerun does not emit, so unchanged ones can't be
+    # skipped. Rewriting them is cheap since the board HTML is memoised.
+    # Moves and resets are applied in button callbacks before the script
+    # runs, so each element is written once, straight into its column,
+    # with no st.empty() placeholder to fill in afterwards.
+    render_status(status_col)
     render_new_game_button(status_col)
+    render_board(board_container)
     render_info_card(info_col)
     render_buttons(board_container)
 
+    if st.session_state.ai_future is not None:
+        wait_for_ai_move()
+
 
 if __name__ == "__main__":
     main()